@@ -1,62 +1,272 @@
-from kubernetes import client, config
+from kubernetes import client, config, watch
 from abc import ABC
+from dataclasses import dataclass
 import os
+import time
 import logging
+import threading
 from typing import Optional
+from .config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Pod/service listings cached per namespace and shared across instances, so
+# constructing several API clients does not re-LIST against the apiserver.
+# Entries are (expiry, names); the lock also stops thundering-herd re-lists.
+_list_cache = {}
+_list_cache_lock = threading.Lock()
+
+# Service->pods lookups cached the same way: agents typically call several
+# tools against one service back to back, and each of them resolves the
+# service's pods first. Entries are (expiry, result) keyed by
+# (namespace, service); error results are never cached.
+_service_pods_cache = {}
+_service_pods_cache_lock = threading.Lock()
+_SERVICE_PODS_TTL = 15.0
+
+@dataclass(slots=True)
+class PodLite:
+    """Lightweight projection of a V1Pod holding only the fields we read"""
+    name: str
+    labels: frozenset
+    phase: Optional[str]
+
+@dataclass(slots=True)
+class ServiceLite:
+    """Lightweight projection of a V1Service holding only the fields we read"""
+    name: str
+    selector_items: frozenset
+
 class BaseK8sClient(ABC):
     """Base class for Kubernetes API interactions"""
-    
+
     def __init__(self, namespace: Optional[str] = None):
-        self.namespace = namespace or os.environ.get("TARGET_NAMESPACE", "default")
+        # ConfigManager caches the environment snapshot once per process,
+        # so this avoids re-reading os.environ on every client construction
+        self.namespace = namespace or ConfigManager().config.target_namespace
         self._k8s_client = None
-        self._services_cache = None
-        self._pods_cache = None
-    
+        self._api_client = None
+        self.cache_ttl = ConfigManager().config.k8s_cache_ttl
+        self._selector_index = None
+        self._selector_index_expiry = 0.0
+        self._selector_str_cache = {}
+        # Informer state: local caches kept up to date by background watches
+        self._informer_started = False
+        self._informer_stop = threading.Event()
+        self._informer_threads = []
+        self._pod_by_name = {}
+        self._svc_by_name = {}
+        if os.environ.get("K8S_USE_INFORMER", "").lower() in ("1", "true", "yes"):
+            try:
+                self.start_informer()
+            except Exception as e:
+                logger.error(f"Failed to start informer, falling back to list polling: {e}")
+
     @property
     def k8s_client(self):
         """Lazy initialization of Kubernetes client"""
         if self._k8s_client is None:
             try:
-                config.load_kube_config()
-                self._k8s_client = client.CoreV1Api()
+                # Use a dedicated configuration with a larger urllib3 pool so
+                # concurrent list/read calls reuse connections instead of
+                # serializing on the tiny default pool (maxsize ~4)
+                cfg = client.Configuration()
+                config.load_kube_config(client_configuration=cfg)
+                cfg.connection_pool_maxsize = 50
+                self._api_client = client.ApiClient(configuration=cfg)
+                # Unlike requests, the ApiClient's urllib3 stack does not
+                # advertise compression on its own; pod/service lists are
+                # repetitive JSON that compresses very well
+                self._api_client.set_default_header("Accept-Encoding", "gzip")
+                self._k8s_client = client.CoreV1Api(api_client=self._api_client)
             except Exception as e:
                 logger.error(f"Failed to initialize Kubernetes client: {e}")
                 raise
         return self._k8s_client
     
+    def _project_pod(self, pod):
+        """Project a watched V1Pod into a PodLite, dropping the full object"""
+        labels = pod.metadata.labels or {}
+        phase = pod.status.phase if pod.status else None
+        return PodLite(
+            name=pod.metadata.name,
+            labels=frozenset(labels.items()),
+            phase=phase,
+        )
+
+    def _project_service(self, service):
+        """Project a watched V1Service into a ServiceLite, dropping the full object"""
+        selector = service.spec.selector if service.spec else None
+        return ServiceLite(
+            name=service.metadata.name,
+            selector_items=frozenset(selector.items()) if selector else frozenset(),
+        )
+
+    def _pod_list_call(self):
+        if self.namespace:
+            return self.k8s_client.list_namespaced_pod, {"namespace": self.namespace}
+        return self.k8s_client.list_pod_for_all_namespaces, {}
+
+    def _service_list_call(self):
+        if self.namespace:
+            return self.k8s_client.list_namespaced_service, {"namespace": self.namespace}
+        return self.k8s_client.list_service_for_all_namespaces, {}
+
+    def start_informer(self):
+        """Seed local pod/service caches and keep them updated via watch streams.
+
+        After warmup, list lookups are served from memory instead of issuing
+        a list call against the apiserver on every request.
+        """
+        if self._informer_started:
+            return
+
+        self._informer_stop.clear()
+
+        for list_call, project, cache in (
+            (self._pod_list_call, self._project_pod, self._pod_by_name),
+            (self._service_list_call, self._project_service, self._svc_by_name),
+        ):
+            list_fn, kwargs = list_call()
+            obj_list = list_fn(**kwargs)
+            cache.clear()
+            cache.update({obj.metadata.name: project(obj) for obj in obj_list.items})
+            thread = threading.Thread(
+                target=self._watch_loop,
+                args=(list_fn, kwargs, project, cache, obj_list.metadata.resource_version),
+                daemon=True,
+            )
+            thread.start()
+            self._informer_threads.append(thread)
+
+        self._informer_started = True
+        logger.info(f"Informer started for namespace '{self.namespace}'")
+
+    def stop_informer(self):
+        """Stop the background watch threads and fall back to list polling"""
+        if not self._informer_started:
+            return
+        self._informer_stop.set()
+        self._informer_threads = []
+        self._informer_started = False
+        logger.info("Informer stopped")
+
+    def _watch_loop(self, list_fn, kwargs, project, cache, resource_version):
+        """Consume watch events for one resource type, resyncing on failures"""
+        watcher = watch.Watch()
+        while not self._informer_stop.is_set():
+            try:
+                for event in watcher.stream(list_fn, resource_version=resource_version, timeout_seconds=60, **kwargs):
+                    obj = event["object"]
+                    resource_version = obj.metadata.resource_version
+                    if event["type"] == "DELETED":
+                        cache.pop(obj.metadata.name, None)
+                    else:
+                        cache[obj.metadata.name] = project(obj)
+                    if self._informer_stop.is_set():
+                        break
+            except Exception as e:
+                if self._informer_stop.is_set():
+                    break
+                logger.warning(f"Watch stream interrupted, resyncing: {e}")
+                try:
+                    obj_list = list_fn(**kwargs)
+                    cache.clear()
+                    cache.update({obj.metadata.name: project(obj) for obj in obj_list.items})
+                    resource_version = obj_list.metadata.resource_version
+                except Exception as le:
+                    logger.error(f"Informer resync failed: {le}")
+                time.sleep(1)
+
     def get_services_list(self, use_cache: bool = True):
-        """Get all service names in the namespace with caching"""
-        if not use_cache or self._services_cache is None:
+        """Get all service names in the namespace, cached per namespace with a TTL"""
+        if self._informer_started:
+            return list(self._svc_by_name)
+
+        key = ("services", self.namespace)
+        with _list_cache_lock:
+            entry = _list_cache.get(key)
+            if use_cache and entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
             try:
                 if self.namespace:
                     service_list = self.k8s_client.list_namespaced_service(self.namespace)
                 else:
                     service_list = self.k8s_client.list_service_for_all_namespaces()
-                
-                self._services_cache = [service.metadata.name for service in service_list.items]
+
+                services = [service.metadata.name for service in service_list.items]
+                _list_cache[key] = (time.monotonic() + self.cache_ttl, services)
+                return services
             except Exception as e:
                 logger.error(f"Failed to get services list: {e}")
                 return []
-        
-        return self._services_cache
-    
+
     def get_pods_list(self, use_cache: bool = True):
-        """Get all pod names in the namespace with caching"""
-        if not use_cache or self._pods_cache is None:
+        """Get all pod names in the namespace, cached per namespace with a TTL"""
+        if self._informer_started:
+            return list(self._pod_by_name)
+
+        key = ("pods", self.namespace)
+        with _list_cache_lock:
+            entry = _list_cache.get(key)
+            if use_cache and entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
             try:
                 pod_list = self.k8s_client.list_namespaced_pod(self.namespace)
-                self._pods_cache = [pod.metadata.name for pod in pod_list.items]
+                pods = [pod.metadata.name for pod in pod_list.items]
+                _list_cache[key] = (time.monotonic() + self.cache_ttl, pods)
+                return pods
             except Exception as e:
                 logger.error(f"Failed to get pods list: {e}")
                 return []
-        
-        return self._pods_cache
 
-    def get_pods_from_service(self, service: str):
-        """Return all the pods connected to a service"""
+    def get_selector_index(self, use_cache: bool = True):
+        """Get a {service_name: frozenset(selector items)} index with caching.
+
+        The selectors are fetched once per cache lifetime so pod->service
+        matching does not re-list every Service in the namespace. When the
+        list call fails, a stale index (if any) is served rather than
+        discarded; with nothing to fall back on, None is returned so
+        callers can report the listing failure instead of pretending the
+        namespace has no selectors.
+        """
+        if self._informer_started:
+            return {
+                name: service.selector_items
+                for name, service in list(self._svc_by_name.items())
+                if service.selector_items
+            }
+        if not use_cache or self._selector_index is None or time.monotonic() > self._selector_index_expiry:
+            try:
+                if self.namespace:
+                    service_list = self.k8s_client.list_namespaced_service(self.namespace)
+                else:
+                    service_list = self.k8s_client.list_service_for_all_namespaces()
+
+                index = {}
+                for service in service_list.items:
+                    selector = service.spec.selector if service.spec else None  # type: ignore
+                    if selector:
+                        index[service.metadata.name] = frozenset(selector.items())  # type: ignore
+                self._selector_index = index
+                self._selector_index_expiry = time.monotonic() + self.cache_ttl
+            except Exception as e:
+                logger.error(f"Failed to build service selector index: {e}")
+                # Stale selectors beat a fabricated empty namespace; None
+                # only when there is nothing cached at all
+                return self._selector_index
+
+        return self._selector_index
+
+    def get_pods_from_service(self, service: str, use_cache: bool = True):
+        """Return all the pods connected to a service, cached for a short TTL"""
+        cache_key = (self.namespace, service)
+        if use_cache:
+            with _service_pods_cache_lock:
+                entry = _service_pods_cache.get(cache_key)
+                if entry is not None and time.monotonic() < entry[0]:
+                    return entry[1]
+
         results = {
             "service_name": service,
             "namespace": self.namespace,
@@ -68,32 +278,59 @@ class BaseK8sClient(ABC):
             return results
         
         try:
-            requested_svc = self.k8s_client.read_namespaced_service(service, self.namespace)
-            # Kubernetes objects have complex types, use type: ignore
-            if not hasattr(requested_svc, 'spec') or not hasattr(requested_svc.spec, 'selector'):  # type: ignore
-                results["error"] = f"Service {service} does not have a valid selector."
+            # Both pod->service and service->pod lookups share the cached
+            # selector index instead of issuing their own service reads
+            selector_index = self.get_selector_index()
+            if selector_index is None:
+                results["error"] = f"Failed to list services in the {self.namespace} namespace."
                 return results
-                
-            selector = requested_svc.spec.selector  # type: ignore
-            if not selector:
+
+            selector_items = selector_index.get(service)
+            if not selector_items:
                 results["error"] = f"Service {service} has no selector configured."
                 return results
-                
-            label_selector = ",".join([f"{k}={v}" for k, v in selector.items()])
-            pods = self.k8s_client.list_namespaced_pod(self.namespace, label_selector=label_selector)
-            
-            results["pods"] = [
-                {
-                    "pod_name": pod.metadata.name,  # type: ignore
-                    "pod_status": pod.status.phase  # type: ignore
-                }
-                for pod in pods.items  # type: ignore
-            ]
+
+            # Reuse the canonical selector string for repeat queries of the
+            # same service; sorted items keep the cached form deterministic
+            label_selector = self._selector_str_cache.get(service)
+            if label_selector is None:
+                label_selector = ",".join(f"{k}={v}" for k, v in sorted(selector_items))
+                self._selector_str_cache[service] = label_selector
+
+            # Filter server-side (completed pods are rarely interesting) and
+            # paginate so huge namespaces never come back in one giant list
+            continue_token = None
+            while True:
+                # resource_version="0" is only valid on the first page; the
+                # apiserver rejects lists setting it with a continue token
+                pods = self.k8s_client.list_namespaced_pod(
+                    self.namespace,
+                    label_selector=label_selector,
+                    field_selector="status.phase!=Succeeded",
+                    resource_version="0" if continue_token is None else None,
+                    limit=500,
+                    _continue=continue_token,
+                    _request_timeout=10,
+                )
+                results["pods"].extend(
+                    {
+                        "pod_name": pod.metadata.name,  # type: ignore
+                        "pod_status": pod.status.phase  # type: ignore
+                    }
+                    for pod in pods.items  # type: ignore
+                )
+                continue_token = pods.metadata._continue  # type: ignore
+                if not continue_token:
+                    break
         except Exception as e:
             results["error"] = f"Failed to get pods for service {service}: {str(e)}"
-            
+
+        if "error" not in results:
+            with _service_pods_cache_lock:
+                _service_pods_cache[cache_key] = (time.monotonic() + _SERVICE_PODS_TTL, results)
+
         return results
-    
+
     def get_services_from_pod(self, pod_name: str):
         """Return the service(s) that select a given pod."""
 
@@ -108,32 +345,31 @@ class BaseK8sClient(ABC):
             return results
         
         try:
-            # Get the pod and its labels
-            pod = self.k8s_client.read_namespaced_pod(pod_name, self.namespace)
-            pod_labels = pod.metadata.labels  # type: ignore
-            
-            if not pod_labels:
+            # Get the pod labels from the informer cache when available,
+            # otherwise read the pod from the apiserver
+            if self._informer_started and pod_name in self._pod_by_name:
+                pod_label_items = self._pod_by_name[pod_name].labels
+            else:
+                pod = self.k8s_client.read_namespaced_pod(pod_name, self.namespace)
+                pod_labels = pod.metadata.labels  # type: ignore
+                pod_label_items = frozenset(pod_labels.items()) if pod_labels else frozenset()
+
+            if not pod_label_items:
                 results["error"] = f"Pod {pod_name} has no labels."
                 return results
-            
-            # Get all services in the namespace
-            service_list = self.k8s_client.list_namespaced_service(self.namespace)
-            
-            # Check which services select this pod
-            for service in service_list.items:  # type: ignore
-                if not hasattr(service, 'spec') or not hasattr(service.spec, 'selector'):  # type: ignore
-                    continue
-                
-                selector = service.spec.selector  # type: ignore
-                if not selector:
-                    continue
-                
-                # Check if all selector labels match the pod's labels
-                if all(pod_labels.get(k) == v for k, v in selector.items()):
-                    results["services"].append({
-                        "service_name": service.metadata.name,  # type: ignore
-                        "selector": selector
-                    })
+
+            # Match against the cached selector index instead of re-listing
+            # every Service; selector matching is a single set-containment test
+            selector_index = self.get_selector_index()
+            if selector_index is None:
+                results["error"] = f"Failed to list services in the {self.namespace} namespace."
+                return results
+
+            results["services"] = [
+                {"service_name": service_name, "selector": dict(selector_items)}
+                for service_name, selector_items in selector_index.items()
+                if selector_items <= pod_label_items
+            ]
             
             if not results["services"]:
                 results["info"] = f"No services found selecting pod {pod_name}."
@@ -145,5 +381,12 @@ class BaseK8sClient(ABC):
     
     def refresh_cache(self):
         """Refresh the cached services and pods"""
-        self._services_cache = None
-        self._pods_cache = None
\ No newline at end of file
+        with _list_cache_lock:
+            _list_cache.pop(("services", self.namespace), None)
+            _list_cache.pop(("pods", self.namespace), None)
+        with _service_pods_cache_lock:
+            for key in [key for key in _service_pods_cache if key[0] == self.namespace]:
+                _service_pods_cache.pop(key, None)
+        self._selector_index = None
+        self._selector_index_expiry = 0.0
+        self._selector_str_cache = {}
\ No newline at end of file
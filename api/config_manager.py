@@ -1,9 +1,10 @@
 import os
+import threading
 from dotenv import load_dotenv
 from dataclasses import dataclass
 from typing import Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Config:
     target_namespace: str
     prometheus_url: str
@@ -12,22 +13,30 @@ class Config:
     neo4j_user: str
     neo4j_password: str
     trace_service_starting_point: str
+    k8s_cache_ttl: float
+    prometheus_use_recording_rules: bool
 
 class ConfigManager:
     _instance: Optional['ConfigManager'] = None
     _config: Optional[Config] = None
-    
+    _lock = threading.Lock()
+
     def __new__(cls):
+        # Fast path: no lock once the singleton exists
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
         return cls._instance
-    
+
     def __init__(self):
         if self._config is None:
-            # Load .env if it exists (for standalone use)
-            # Environment variables already set take precedence (override=False)
-            load_dotenv(override=False)
-            self._load_config()
+            with self._lock:
+                if self._config is None:
+                    # Load .env if it exists (for standalone use)
+                    # Environment variables already set take precedence (override=False)
+                    load_dotenv(override=False)
+                    self._load_config()
     
     def _load_config(self):
         """Load configuration from environment variables."""
@@ -38,7 +47,9 @@ class ConfigManager:
             neo4j_uri=os.environ.get("NEO4J_URI", "bolt://localhost:7687"),
             neo4j_user=os.environ.get("NEO4J_USER", "neo4j"),
             neo4j_password=os.environ.get("NEO4J_PASSWORD", "neo4j"),
-            trace_service_starting_point=os.environ.get("TRACE_SERVICE_STARTING_POINT", "frontend")
+            trace_service_starting_point=os.environ.get("TRACE_SERVICE_STARTING_POINT", "frontend"),
+            k8s_cache_ttl=float(os.environ.get("K8S_CACHE_TTL_SECONDS", "30")),
+            prometheus_use_recording_rules=os.environ.get("PROMETHEUS_USE_RECORDING_RULES", "").lower() in ("1", "true", "yes")
         )
     
     def refresh_config(self):
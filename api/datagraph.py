@@ -1,4 +1,5 @@
 from neo4j import GraphDatabase
+import atexit
 import os
 import logging
 from typing import Optional
@@ -6,7 +7,60 @@ from .config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Shared Bolt drivers keyed by (uri, user) so repeated DataGraph
+# construction reuses one connection pool instead of re-handshaking
+_driver_cache = {}
+_driver_refcounts = {}
+
+def _acquire_driver(uri: str, username: str, pw: str):
+    """Get or create the pooled driver for (uri, username), bumping its refcount"""
+    key = (uri, username)
+    driver = _driver_cache.get(key)
+    if driver is None:
+        driver = GraphDatabase.driver(
+            uri=uri,
+            auth=(username, pw),
+            max_connection_pool_size=50,
+            connection_acquisition_timeout=30,
+            max_connection_lifetime=3600,
+        )
+        _driver_cache[key] = driver
+        _driver_refcounts[key] = 0
+    _driver_refcounts[key] += 1
+    return driver
+
+def _release_driver(key):
+    """Drop one reference to a pooled driver, closing it when unused"""
+    if key not in _driver_cache:
+        return
+    _driver_refcounts[key] -= 1
+    if _driver_refcounts[key] <= 0:
+        _driver_cache.pop(key).close()
+        _driver_refcounts.pop(key)
+
+def _close_all_drivers():
+    """Close any pooled drivers still open at interpreter exit"""
+    for driver in _driver_cache.values():
+        try:
+            driver.close()
+        except Exception:
+            pass
+    _driver_cache.clear()
+    _driver_refcounts.clear()
+
+atexit.register(_close_all_drivers)
+
 class DataGraph():
+
+    # Cypher statements as constants: the text is byte-identical on every
+    # call, so Neo4j's server-side plan cache always hits
+    _SERVICES_QUERY = "MATCH (s:Service) RETURN s.name"
+    _SERVICES_USED_BY_QUERY = "MATCH (s:Service {name: $service_name})-[:CALLS]->(c:Service) RETURN c.name"
+    _DEPENDENCIES_QUERY = """
+    MATCH (s:Service {name: $service_name})-[:USES]->(dependency)
+    RETURN dependency.name AS dependencyName, labels(dependency)[0] AS dependencyType
+    """
+
     def __init__(self, uri: Optional[str] = None, username: Optional[str] = None, pw: Optional[str] = None) -> None:
         # Use ConfigManager if parameters not provided
         if not all([uri, username, pw]):
@@ -20,18 +74,20 @@ class DataGraph():
         assert uri is not None and username is not None and pw is not None, "Neo4j connection parameters must be provided either directly or via configuration"
         
         self.driver = None
-        auth = (username, pw)
+        self._driver_key = (uri, username)
         try:
-            self.driver = GraphDatabase.driver(uri=uri, auth=auth)
+            self.driver = _acquire_driver(uri, username, pw)
         except Exception as e:
             logger.error("Error creating the driver: ", e)
         self.services = self.get_services()
+        self._services_set = set(self.services)
 
     def close(self):
-        """Close the connection to the kubernetes driver"""
+        """Release this instance's reference to the shared neo4j driver"""
         if self.driver is not None:
-            self.driver.close()
-        logger.info("neo4j driver closed")
+            _release_driver(self._driver_key)
+            self.driver = None
+        logger.info("neo4j driver released")
         
     def query(self, query, parameters=None, db=None):
         """Query neo4j database"""
@@ -44,11 +100,46 @@ class DataGraph():
             response = [record.data() for record in result]  # Convert records to dictionaries
         except Exception as e:
             logger.error("Query failed:", e)
-        finally: 
+        finally:
             if session is not None:
                 session.close()
         return response
-    
+
+    def query_column(self, query, column, parameters=None, db=None):
+        """Query neo4j and return one column as a flat list.
+
+        Skips the per-record dict that record.data() allocates, which adds
+        up on large result sets like the full service listing.
+        """
+        assert self.driver is not None, "Driver not initialized!"
+        session = None
+        response = None
+        try:
+            session = self.driver.session(database=db) if db is not None else self.driver.session()
+            result = session.run(query, parameters)
+            response = [record[column] for record in result]
+        except Exception as e:
+            logger.error("Query failed:", e)
+        finally:
+            if session is not None:
+                session.close()
+        return response
+
+    def run_many(self, queries, db=None):
+        """Run several queries in a single session and transaction.
+
+        One session handshake and one commit instead of one per statement.
+        Returns the number of queries executed, or None on failure.
+        """
+        assert self.driver is not None, "Driver not initialized!"
+        try:
+            with self.driver.session(database=db) if db is not None else self.driver.session() as session:
+                session.execute_write(lambda tx: [tx.run(query) for query in queries])
+            return len(queries)
+        except Exception as e:
+            logger.error("Batch query failed:", e)
+            return None
+
     def drop_datagraph(self, confirmation: Optional[bool] = None):
         """Drop all nodes and relationships in the database after confirmation.
 
@@ -90,45 +181,35 @@ class DataGraph():
                 lines.append(line)
             queries = '\n'.join(lines)
             
-            # Split queries by semicolon and execute each query
-            query_count = 0
-            for query in queries.split(';'):
-                query = query.strip()
-                if query:  # Skip empty queries
-                    result = self.query(query)
-                    query_count += 1
-                    if result is None:
-                        logger.warning(f"Query {query_count} returned None or failed: {query[:50]}...")
-            logger.info(f"Datagraph created successfully. Executed {query_count} queries.")
+            # Split queries by semicolon and execute them in one transaction
+            query_list = [query.strip() for query in queries.split(';') if query.strip()]
+            query_count = self.run_many(query_list)
+            if query_count is None:
+                logger.warning("Datagraph creation failed, no queries were committed.")
+            else:
+                logger.info(f"Datagraph created successfully. Executed {query_count} queries.")
         except Exception as e:
             logger.error("Failed to create datagraph:", e)
 
     def get_services(self) -> list:
         """Return all the kubernetes services in the cluster"""
-        result = self.query("MATCH (s:Service) RETURN s.name")
-        services = [record["s.name"] for record in result] if result else []
-        return services
+        services = self.query_column(self._SERVICES_QUERY, "s.name")
+        return services if services else []
     
     def get_services_used_by(self, service: str) -> str | list:
         """Return all the services that are used by the given service to complete its tasks"""
-        if service not in self.services:
+        if service not in self._services_set:
             return f"The service {service} doesn't exist in the cluster."
-        query = "MATCH (s:Service {name: $service_name})-[:CALLS]->(c:Service) RETURN c.name"
         params = {"service_name": service}
-        result = self.query(query, params)
-        services_used = [record["c.name"] for record in result] if result else []
-        return services_used
+        services_used = self.query_column(self._SERVICES_USED_BY_QUERY, "c.name", params)
+        return services_used if services_used else []
     
     def get_dependencies(self, service: str) -> str | dict:
         """Retrieves all dependencies for a specified service from kubernetes cluster."""
-        if service not in self.services:
+        if service not in self._services_set:
             return f"The service {service} doesn't exist in the cluster."
-        query = """
-        MATCH (s:Service {name: $service_name})-[:USES]->(dependency)
-        RETURN dependency.name AS dependencyName, labels(dependency)[0] AS dependencyType
-        """
         params = {"service_name": service}
-        result = self.query(query, params)
+        result = self.query(self._DEPENDENCIES_QUERY, params)
 
         if result and len(result) > 0:
             return {record["dependencyName"]: record["dependencyType"] for record in result}
@@ -139,7 +220,7 @@ class DataGraph():
         """
         Generates a summary of a given service, including the services it calls and its dependencies (for LLM purposes).
         """
-        if service not in self.services:
+        if service not in self._services_set:
             return f"The service {service} doesn't exist in the cluster."
         services_used = self.get_services_used_by(service)
         dependencies = self.get_dependencies(service)
@@ -151,6 +232,6 @@ class DataGraph():
             summary += f"doesn't use any other services to complete its tasks."
 
         if isinstance(dependencies, dict) and len(dependencies) > 0:
-            summary += f" It has the following {len(dependencies.keys())} dependencies: " + ", ".join([f"{name} ({dep_type})" for name, dep_type in dependencies.items()]) + "."
+            summary += f" It has the following {len(dependencies)} dependencies: " + ", ".join(f"{name} ({dep_type})" for name, dep_type in dependencies.items()) + "."
 
         return summary
\ No newline at end of file
@@ -1,19 +1,121 @@
 import requests
+from requests.adapters import HTTPAdapter
+import atexit
+import concurrent.futures
+import heapq
 import logging
+import multiprocessing
+import os
+import threading
+import time
 from typing import Optional, Dict, List, Any
 from .base_k8s_client import BaseK8sClient
 from .config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# Prefer orjson for decoding Jaeger payloads (2-5x faster than stdlib json
+# on the multi-megabyte trace responses); fall back to stdlib if missing
+try:
+    import orjson
+
+    def _json_loads(data: bytes):
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def _json_loads(data: bytes):
+        return json.loads(data)
+
+# Optional incremental JSON parser: lets trace fetches parse straight off
+# the socket instead of buffering the whole response body first
+try:
+    import ijson
+    _IJSON_ERRORS = (ijson.common.JSONError,)
+except ImportError:
+    ijson = None
+    _IJSON_ERRORS = ()
+
+# Traces are immutable once recorded, so fetched-by-ID traces are cached
+# for the lifetime of the process (bounded, no TTL needed)
+_trace_cache: Dict[str, Any] = {}
+_trace_cache_lock = threading.Lock()
+_TRACE_CACHE_MAX = 1024
+
+# Processed trace listings change as new traces arrive, so they only get a
+# short TTL; agents re-exploring the same service within the window are
+# served from memory. Entries are (expiry, results).
+_processed_cache: Dict[Any, Any] = {}
+_processed_cache_lock = threading.Lock()
+_PROCESSED_CACHE_TTL = 30.0
+
+# Shared process pool for large trace batches, created lazily and reused
+# across calls. The workers are started via forkserver/spawn rather than
+# fork: this server runs worker threads (async tool shims, the fan-out
+# executor, optional informer watches), and forking a multi-threaded
+# process is deadlock-prone.
+_trace_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_trace_pool_lock = threading.Lock()
+
+def _get_trace_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Get or create the shared trace-processing process pool"""
+    global _trace_pool
+    with _trace_pool_lock:
+        if _trace_pool is None:
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _trace_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=os.cpu_count(),
+                mp_context=multiprocessing.get_context(method),
+            )
+        return _trace_pool
+
+def _shutdown_trace_pool():
+    """Shut down the shared process pool at interpreter exit"""
+    global _trace_pool
+    with _trace_pool_lock:
+        if _trace_pool is not None:
+            _trace_pool.shutdown(cancel_futures=True)
+            _trace_pool = None
+
+atexit.register(_shutdown_trace_pool)
+
+# Shared HTTP session so multiple JaegerAPI instances reuse one connection pool
+_session: Optional[requests.Session] = None
+
+def get_session() -> requests.Session:
+    """Get or create the shared requests.Session with a pooled HTTP adapter"""
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        _session.mount("http://", adapter)
+        _session.mount("https://", adapter)
+    return _session
+
 class JaegerAPI(BaseK8sClient):
+    # (connect, read) timeouts in seconds for Jaeger HTTP calls
+    request_timeout = (3, 30)
+    # Minimum batch size before trace processing is farmed out to a pool
+    parallel_threshold = 50
+    # Stop scanning spans for error details after this many messages
+    MAX_ERROR_MESSAGES = 3
+
     def __init__(self, jaeger_url: Optional[str] = None):
         config_manager = ConfigManager()
         self.jaeger_url = jaeger_url or config_manager.config.jaeger_url
-        
+        self._session = get_session()
+
         # Initialize with namespace=None to get all services across namespaces
         super().__init__(namespace=None)
         self.services = self.get_services_list()
+        self._services_set = set(self.services)
+
+    def close(self):
+        """Close the underlying HTTP session"""
+        global _session
+        self._session.close()
+        if self._session is _session:
+            _session = None
     
     def get_jaeger_traces(self, service: str, limit: int = 20, lookback: str = "15m", min_latency_ms: Optional[float] = None, only_errors: bool = False):
         """Fetches traces from the Jaeger Query API, optionally filtering by minimum latency (ms) and error traces using Jaeger API parameters."""
@@ -32,38 +134,49 @@ class JaegerAPI(BaseK8sClient):
             params["tags"] = '{"error":"true"}'
 
         try:
-            response = requests.get(api_url, params=params)
+            if ijson is not None:
+                # Stream-parse the traces as they arrive so the raw multi-MB
+                # body is never held in memory alongside the parsed objects
+                with self._session.get(api_url, params=params, stream=True, timeout=self.request_timeout) as response:
+                    response.raise_for_status()
+                    # .raw hands out the undecoded body; tell urllib3 to
+                    # gunzip it on read so ijson sees JSON, not gzip bytes
+                    response.raw.decode_content = True
+                    return list(ijson.items(response.raw, "data.item"))
+            response = self._session.get(api_url, params=params, timeout=self.request_timeout)
             response.raise_for_status()
-            traces = response.json().get("data", [])
+            traces = _json_loads(response.content).get("data", [])
             return traces
         except requests.exceptions.RequestException as e:
             logger.error(f"Error connecting to Jaeger: {e}")
             return None
-        except KeyError:
-            logger.error("Unexpected response format from Jaeger. 'data' key not found.")
+        except (KeyError, *_IJSON_ERRORS) as e:
+            logger.error(f"Unexpected response format from Jaeger: {e}")
             return None
 
-    def process_trace(self, trace: Dict[str, Any]):
+    @staticmethod
+    def process_trace(trace: Dict[str, Any]):
         """Extracts latency, service sequence, and error details from a single trace."""
         
-        # Find the Root Span and Total Latency
+        # Single pass over the spans: find the root span, scan for errors,
+        # and record (startTime, processID) for the sequence ordering
         root_span = None
-        for span in trace["spans"]:
-            if not span.get("references"):
-                root_span = span
-                break
-                
-        if not root_span:
-            return None
-
-        latency_ms = root_span["duration"] / 1000.0
-
-        # Check for Errors and Extract Messages
         has_error = False
         error_message = "N/A"
         error_details = [] # Store multiple error messages if they exist
+        ordering = []
 
         for span in trace["spans"]:
+            ordering.append((span["startTime"], span["processID"]))
+
+            if root_span is None and not span.get("references"):
+                root_span = span
+
+            # A few messages are plenty for display; skip the error scan
+            # for the remaining spans once enough have been collected
+            if len(error_details) >= JaegerAPI.MAX_ERROR_MESSAGES:
+                continue
+
             is_error_span = False
             for tag in span.get("tags", []):
                 if tag.get("key") == "error" and tag.get("value") is True:
@@ -74,29 +187,40 @@ class JaegerAPI(BaseK8sClient):
             # If this span has the error, search its logs for the reason
             if is_error_span:
                 for log in span.get("logs", []):
-                    # Find fields like 'event: error', 'message', or 'stack'
-                    log_fields = {field['key']: field['value'] for field in log.get("fields", [])}
-                    if log_fields.get("event") == "error":
-                        if "message" in log_fields:
-                            error_details.append(log_fields["message"])
-                        if "stack" in log_fields: # Stack traces can be verbose but useful
-                            error_details.append(log_fields["stack"].split('\n')[0]) # Get first line of stack
-        
+                    # Scan the fields with short-circuiting generators instead
+                    # of materializing a dict per log entry
+                    fields = log.get("fields", [])
+                    if not any(f.get("key") == "event" and f.get("value") == "error" for f in fields):
+                        continue
+                    message = next((f["value"] for f in fields if f.get("key") == "message"), None)
+                    if message is not None:
+                        error_details.append(message)
+                    stack = next((f["value"] for f in fields if f.get("key") == "stack"), None)
+                    if stack is not None: # Stack traces can be verbose but useful
+                        error_details.append(stack.split('\n', 1)[0]) # Get first line of stack
+                    if message is not None and stack is not None:
+                        break # This span's reason is captured, skip its remaining logs
+
+        if not root_span:
+            return None
+
+        latency_ms = root_span["duration"] / 1000.0
+
         if error_details:
             error_message = "; ".join(error_details) # Join multiple messages
 
-        # Determine the Sequence of Services
+        # Determine the Sequence of Services from the collected ordering
         service_map = {p_id: p_info["serviceName"] for p_id, p_info in trace["processes"].items()}
-        sorted_spans = sorted(trace["spans"], key=lambda s: s["startTime"])
-        
+        ordering.sort(key=lambda entry: entry[0])
+
         service_sequence = []
         last_service = None
-        for span in sorted_spans:
-            service_name = service_map.get(span["processID"])
+        for _, process_id in ordering:
+            service_name = service_map.get(process_id)
             if service_name and service_name != last_service:
                 service_sequence.append(service_name)
                 last_service = service_name
-                
+
         result = {
             "traceID": trace["traceID"],
             "latency_ms": latency_ms,
@@ -109,13 +233,44 @@ class JaegerAPI(BaseK8sClient):
         
         return result
     
+    def process_traces(self, traces: List[Dict[str, Any]], only_errors: bool = False) -> List[Dict[str, Any]]:
+        """Process a batch of traces, dropping those without a root span.
+
+        When only_errors is True, error-free traces are discarded before
+        being appended (Jaeger filters server-side, but this guards against
+        traces whose error tag sits below the queried service).
+
+        Large batches are decoded in a process pool; each trace is
+        independent, and the worker processes sidestep the GIL. Small
+        batches stay serial since pool startup would dominate.
+        """
+        if len(traces) >= self.parallel_threshold:
+            candidates = _get_trace_pool().map(JaegerAPI.process_trace, traces, chunksize=4)
+            processed = [
+                trace_data for trace_data in candidates
+                if trace_data and (not only_errors or trace_data["has_error"])
+            ]
+        else:
+            processed = []
+            for trace in traces:
+                trace_data = self.process_trace(trace)
+                if trace_data and (not only_errors or trace_data["has_error"]):
+                    processed.append(trace_data)
+        return processed
+
     def get_processed_traces(self, service: str, limit: int = 20, lookback: str = "15m", only_errors: bool = False) -> Dict[str, Any]:
         results = {}
 
-        if service not in self.services:
+        if service not in self._services_set:
             results["error"] = f"The service {service} does not exist"
             return results
 
+        cache_key = (service, limit, lookback, only_errors)
+        with _processed_cache_lock:
+            entry = _processed_cache.get(cache_key)
+            if entry is not None and time.monotonic() < entry[0]:
+                return entry[1]
+
         results["service"] = service
         results["traces"] = []
 
@@ -131,27 +286,36 @@ class JaegerAPI(BaseK8sClient):
             results["info"] = f"No traces found for service '{service}' with lookback '{lookback}'."
             return results
 
-        for trace in traces:
-            trace_data = self.process_trace(trace)
-            if trace_data:
-                results["traces"].append(trace_data)
+        results["traces"] = self.process_traces(traces, only_errors=only_errors)
 
         results["traces_count"] = len(results["traces"])
 
+        with _processed_cache_lock:
+            _processed_cache[cache_key] = (time.monotonic() + _PROCESSED_CACHE_TTL, results)
+
         return results
-        
+
     def get_trace(self, trace_id: str):
-        """Fetches a single trace by trace ID from Jaeger."""
+        """Fetches a single trace by trace ID from Jaeger, caching by ID."""
+        with _trace_cache_lock:
+            if trace_id in _trace_cache:
+                return _trace_cache[trace_id]
+
         logger.info(f"Querying Jaeger for trace ID: {trace_id}")
         api_url = f"{self.jaeger_url}/api/traces/{trace_id}"
-        
+
         try:
-            response = requests.get(api_url)
+            response = self._session.get(api_url, timeout=self.request_timeout)
             response.raise_for_status()
-            trace_data = response.json()
+            trace_data = _json_loads(response.content)
             
             if "data" in trace_data and len(trace_data["data"]) > 0:
-                return trace_data["data"][0]
+                trace = trace_data["data"][0]
+                with _trace_cache_lock:
+                    if len(_trace_cache) >= _TRACE_CACHE_MAX:
+                        _trace_cache.clear()
+                    _trace_cache[trace_id] = trace
+                return trace
             else:
                 logger.warning(f"No trace found with ID: {trace_id}")
                 return None
@@ -183,7 +347,7 @@ class JaegerAPI(BaseK8sClient):
 
         results = {}
 
-        if service not in self.services:
+        if service not in self._services_set:
             results["error"] = f"The service {service} does not exist"
             return results
 
@@ -204,14 +368,10 @@ class JaegerAPI(BaseK8sClient):
             results["info"] = f"No traces found for service '{service}' with a minimum duration of {min_duration_ms}ms in the last {lookback}."
             return results
 
-        # Process and return only the slow traces
-        for trace in traces:
-            trace_data = self.process_trace(trace)
-            if trace_data:
-                results["traces"].append(trace_data)
-
-        # Sort by latency (slowest first)
-        results["traces"].sort(key=lambda x: x["latency_ms"], reverse=True)
+        # Process and keep only the `limit` slowest traces, ordered slowest
+        # first; nlargest is O(n log k) vs O(n log n) for a full sort
+        processed = self.process_traces(traces, only_errors=only_errors)
+        results["traces"] = heapq.nlargest(limit, processed, key=lambda x: x["latency_ms"])
 
         results["traces_count"] = len(results["traces"])
 
@@ -1,8 +1,19 @@
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List, Any
 from .base_k8s_client import BaseK8sClient
 from .config_manager import ConfigManager
 
 class K8sAPI(BaseK8sClient):
+
+    # Phases worth scanning for problems. Running pods are included because
+    # crash-looping containers usually sit in a pod reported as Running;
+    # only Succeeded pods can be skipped entirely.
+    _PROBLEM_PHASE_SELECTORS = (
+        "status.phase=Pending",
+        "status.phase=Failed",
+        "status.phase=Unknown",
+        "status.phase=Running",
+    )
     def __init__(self, namespace: Optional[str] = None):
         config_manager = ConfigManager()
         self._target_namespace = namespace or config_manager.config.target_namespace
@@ -10,93 +21,148 @@ class K8sAPI(BaseK8sClient):
         self.services = self.get_services_list()
         self.pods = self.get_pods_list()
 
-    def get_problematic_pods(self) -> dict:
+    def _list_pods_by_selector(self, field_selector: str):
+        """List pods matching a field selector, served from the watch cache and paginated"""
+        pods = []
+        continue_token = None
+        while True:
+            # resource_version="0" (watch-cache read) is only valid on the
+            # first page; the apiserver rejects lists that set it alongside
+            # a continue token
+            pod_list = self.k8s_client.list_namespaced_pod(
+                self.namespace,
+                field_selector=field_selector,
+                resource_version="0" if continue_token is None else None,
+                limit=500,
+                _continue=continue_token,
+            )
+            pods.extend(pod_list.items)
+            continue_token = pod_list.metadata._continue
+            if not continue_token:
+                break
+        return pods
+
+    def iter_problematic_pods(self):
         """
-        Scans a Kubernetes namespace for problematic pods and returns them
-        in a JSON format suitable for an LLM.
+        Scans the namespace and yields one problematic-pod dict at a time.
 
-        Args:
-            namespace: The Kubernetes namespace to scan.
+        Streaming callers can start consuming results before the full
+        cluster scan completes; list errors propagate to the caller.
 
-        Returns:
-            A JSON string listing problematic pods and their issues.
+        Yields:
+            dict: {pod_name, namespace, pod_phase, container_issues}
         """
-        
-        report = {}
-        report["problematic_pods"] = []
-        
-        try:
-            pod_list = self.k8s_client.list_namespaced_pod(self.namespace)
-        except Exception as e:
-            return {"error": f"Could not list pods in namespace '{self.namespace}': {e.body}"} #type: ignore
+        # One phase-filtered LIST per candidate phase, issued in parallel;
+        # Succeeded pods never reach the scan at all
+        pods = []
+        with ThreadPoolExecutor(max_workers=len(self._PROBLEM_PHASE_SELECTORS)) as pool:
+            for phase_pods in pool.map(self._list_pods_by_selector, self._PROBLEM_PHASE_SELECTORS):
+                pods.extend(phase_pods)
 
-        for pod in pod_list.items:
-            pod_issues = []
+        for pod in pods:
+            # Hoist the attribute chains into locals; healthy pods (the vast
+            # majority) should fall through this loop with minimal work
+            status = pod.status
+            container_statuses = status.container_statuses
 
             # A pod might not have container_statuses if it's still pending scheduling
-            if not pod.status.container_statuses:
+            if not container_statuses:
                 # Check if the pod is stuck in a Pending state for a non-container reason
-                if pod.status.phase == 'Pending':
-                    pod_issues.append({
-                        "container_name": "N/A",
-                        "issue_type": "Pod Pending",
-                        "reason": pod.status.reason or "Unknown",
-                        "message": pod.status.message or "Waiting for scheduling or resources."
-                    })
+                if status.phase == 'Pending':
+                    yield {
+                        "pod_name": pod.metadata.name,
+                        "namespace": pod.metadata.namespace,
+                        "pod_phase": status.phase,
+                        "container_issues": [{
+                            "container_name": "N/A",
+                            "issue_type": "Pod Pending",
+                            "reason": status.reason or "Unknown",
+                            "message": status.message or "Waiting for scheduling or resources."
+                        }]
+                    }
                 continue # Go to the next pod
 
-            for container in pod.status.container_statuses:
+            # Allocated lazily: healthy pods never build an issue list
+            pod_issues = None
+            for container in container_statuses:
+                state = container.state
+                waiting = state.waiting
+                terminated = state.terminated
+                restart_count = container.restart_count
+
                 # 1. Check for containers in a waiting state
-                if container.state.waiting:
-                    pod_issues.append({
+                if waiting:
+                    issue = {
                         "container_name": container.name,
                         "issue_type": "Waiting",
-                        "reason": container.state.waiting.reason,
-                        "message": container.state.waiting.message,
-                        "restart_count": container.restart_count
-                    })
+                        "reason": waiting.reason,
+                        "message": waiting.message,
+                        "restart_count": restart_count
+                    }
 
                 # 2. Check for containers that terminated with an error code
-                elif container.state.terminated and container.state.terminated.exit_code != 0:
-                    pod_issues.append({
+                elif terminated and terminated.exit_code != 0:
+                    issue = {
                         "container_name": container.name,
                         "issue_type": "Terminated With Error",
-                        "reason": container.state.terminated.reason,
-                        "message": container.state.terminated.message,
-                        "exit_code": container.state.terminated.exit_code,
-                        "restart_count": container.restart_count
-                    })
+                        "reason": terminated.reason,
+                        "message": terminated.message,
+                        "exit_code": terminated.exit_code,
+                        "restart_count": restart_count
+                    }
 
                 # 3. Check for high restart counts (a strong sign of a crash loop)
                 # A threshold like 3 is good to avoid flagging pods that had a single transient restart.
-                elif container.restart_count > 3:
+                elif restart_count > 3:
                     # Often, a crashing container will be in a 'Running' state just before
                     # the next crash, so we check this separately.
                     reason = "High Restart Count"
                     # If the last state was termination, we can get more info
-                    if container.last_state and container.last_state.terminated:
-                        reason = container.last_state.terminated.reason or reason
+                    last_state = container.last_state
+                    if last_state and last_state.terminated:
+                        reason = last_state.terminated.reason or reason
 
-                    pod_issues.append({
+                    issue = {
                         "container_name": container.name,
                         "issue_type": "High Restarts",
                         "reason": reason,
                         "message": "Container is restarting frequently, indicating a potential crash loop.",
-                        "restart_count": container.restart_count
-                    })
+                        "restart_count": restart_count
+                    }
+
+                else:
+                    continue
+
+                if pod_issues is None:
+                    pod_issues = []
+                pod_issues.append(issue)
 
-            # If we found any issues for this pod, add it to our report
+            # If we found any issues for this pod, yield it to the caller
             if pod_issues:
-                report["problematic_pods"].append({
+                yield {
                     "pod_name": pod.metadata.name,
                     "namespace": pod.metadata.namespace,
-                    "pod_phase": pod.status.phase,
+                    "pod_phase": status.phase,
                     "container_issues": pod_issues
-                })
+                }
 
-        if len(report["problematic_pods"]) == 0:
+    def get_problematic_pods(self) -> dict:
+        """
+        Scans a Kubernetes namespace for problematic pods and returns them
+        in a JSON format suitable for an LLM.
+
+        Returns:
+            A dict listing problematic pods and their issues.
+        """
+        report = {}
+        try:
+            report["problematic_pods"] = list(self.iter_problematic_pods())
+        except Exception as e:
+            return {"error": f"Could not list pods in namespace '{self.namespace}': {e.body}"} #type: ignore
+
+        if not report["problematic_pods"]:
             report["info"] = "No problematic pods detected based on status analysis. All pods appear healthy."
-                
+
         return report
 
     
\ No newline at end of file
@@ -1,42 +1,91 @@
+import codecs
+import re
+import threading
 from typing import Optional
 from .base_k8s_client import BaseK8sClient
 
+# One LogAPI per namespace, shared across tool calls so the kubernetes
+# ApiClient and its connection pool are reused instead of rebuilt
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_log_api(namespace: Optional[str] = None) -> "LogAPI":
+    """Get the shared LogAPI instance for a namespace, creating it once"""
+    with _instances_lock:
+        instance = _instances.get(namespace)
+        if instance is None:
+            instance = LogAPI(namespace=namespace)
+            _instances[namespace] = instance
+        return instance
+
+# Extended list of important keywords
+IMPORTANT_KEYWORDS = [
+    "ERROR", "WARN", "CRITICAL", "FATAL", "PANIC",
+    "EXCEPTION", "FAILURE", "FAILED", "TIMEOUT",
+    "REFUSED", "DENIED", "UNREACHABLE", "RESTART",
+    "CRASH", "KILLED", "OOM", "5xx", "500", "503", "502",
+    "4xx", "401", "403", "404", "CONNECTION", "DISK"
+]
+
+# Single case-insensitive alternation compiled once: matching happens in the
+# C regex engine instead of a Python loop over every keyword per line.
+# google-re2 compiles the alternation into a DFA that scans all keywords in
+# one pass over each line; it is optional, so fall back to stdlib re.
+_IMPORTANT_PATTERN = "|".join(re.escape(keyword) for keyword in IMPORTANT_KEYWORDS)
+try:
+    import re2
+    # google-re2 replaces the re flags with an Options object
+    _re2_options = re2.Options()
+    _re2_options.case_sensitive = False
+    _IMPORTANT_RE = re2.compile(_IMPORTANT_PATTERN, options=_re2_options)
+except (ImportError, AttributeError, TypeError):
+    _IMPORTANT_RE = re.compile(_IMPORTANT_PATTERN, re.IGNORECASE)
+
 class LogAPI(BaseK8sClient):
     def __init__(self, namespace: Optional[str] = None):
         super().__init__(namespace)
         # Initialize pod and service lists using inherited methods
         self.pods = self.get_pods_list()
         self.services = self.get_services_list()
+        # Frozen snapshot for O(1) membership checks on every log request
+        self._pods_set = frozenset(self.pods)
     
     def get_pod_logs(self, pod_name: str, tail: int = 100, important: bool = True) -> str:
         # Check if the pod exists
-        if pod_name not in self.pods:
+        if pod_name not in self._pods_set:
             return f"The pod {pod_name} does not exist in the {self.namespace} namespace."
         
-        try:
-            logs = self.k8s_client.read_namespaced_pod_log(
-                name=pod_name,
-                namespace=self.namespace,
-                tail_lines=tail,
-            )
-        except Exception as e:
-            return f"Failed to get logs for pod {pod_name}: {str(e)}"
-
         if important:
-            # Split logs into lines
-            log_lines = logs.split('\n')
-
-            # Extended list of important keywords
-            important_keywords = [
-                "ERROR", "WARN", "CRITICAL", "FATAL", "PANIC",
-                "EXCEPTION", "FAILURE", "FAILED", "TIMEOUT",
-                "REFUSED", "DENIED", "UNREACHABLE", "RESTART",
-                "CRASH", "KILLED", "OOM", "5xx", "500", "503", "502",
-                "4xx", "401", "403", "404", "CONNECTION", "DISK"
-            ]
-
-            # Return only the log lines that contains the important keywords (case-insensitive)
-            filtered_logs = [line for line in log_lines if any(keyword in line.upper() for keyword in important_keywords)]
+            # Stream the response and filter line by line instead of
+            # materializing the full log string and then splitting it;
+            # the full lines are kept only as the no-match fallback
+            log_lines = []
+            filtered_logs = []
+            try:
+                response = self.k8s_client.read_namespaced_pod_log(
+                    name=pod_name,
+                    namespace=self.namespace,
+                    tail_lines=tail,
+                    _preload_content=False,
+                )
+                # Incremental decoder so multibyte characters split across
+                # chunk boundaries aren't mangled into replacement chars
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                buffer = ""
+                for chunk in response.stream(amt=65536):
+                    buffer += decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+                    *lines, buffer = buffer.split('\n')
+                    for line in lines:
+                        log_lines.append(line)
+                        if _IMPORTANT_RE.search(line):
+                            filtered_logs.append(line)
+                buffer += decoder.decode(b"", final=True)
+                if buffer:
+                    log_lines.append(buffer)
+                    if _IMPORTANT_RE.search(buffer):
+                        filtered_logs.append(buffer)
+            except Exception as e:
+                return f"Failed to get logs for pod {pod_name}: {str(e)}"
 
             results = ""
 
@@ -49,4 +98,11 @@ class LogAPI(BaseK8sClient):
             
             return results
         else:
-            return logs
\ No newline at end of file
+            try:
+                return self.k8s_client.read_namespaced_pod_log(
+                    name=pod_name,
+                    namespace=self.namespace,
+                    tail_lines=tail,
+                )
+            except Exception as e:
+                return f"Failed to get logs for pod {pod_name}: {str(e)}"
\ No newline at end of file
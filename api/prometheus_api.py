@@ -1,5 +1,10 @@
 from prometheus_api_client import PrometheusConnect
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import re
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional, Dict, List, Any
 from .base_k8s_client import BaseK8sClient
@@ -7,6 +12,53 @@ from .config_manager import ConfigManager
 
 logger = logging.getLogger(__name__)
 
+# One PrometheusAPI per namespace, shared across tool calls so the
+# underlying requests.Session (and its keep-alive connections) is reused
+# instead of being rebuilt on every invocation
+_instances = {}
+_instances_lock = threading.Lock()
+
+def get_prometheus_api(namespace: Optional[str] = None) -> "PrometheusAPI":
+    """Get the shared PrometheusAPI instance for a namespace, creating it once"""
+    with _instances_lock:
+        instance = _instances.get(namespace)
+        if instance is None:
+            instance = PrometheusAPI(namespace=namespace)
+            _instances[namespace] = instance
+        return instance
+
+# Short-lived cache for instant metric snapshots: triage, logs and metric
+# tools often hit the same pod within seconds, and a few seconds of
+# staleness is irrelevant for instant values. Entries are (expiry, result).
+_metrics_cache = {}
+_metrics_cache_lock = threading.Lock()
+_METRICS_CACHE_TTL = 5.0
+_METRICS_CACHE_MAX = 1024
+
+# Optional orjson for decoding Prometheus response bodies, which are large
+# on range queries; falls back to the stdlib parser
+try:
+    import orjson
+
+    def _json_loads(data):
+        return orjson.loads(data)
+except ImportError:
+    import json
+
+    def _json_loads(data):
+        return json.loads(data)
+
+# Optional NumPy acceleration for decoding range-query samples; the values
+# still leave as plain lists since results are JSON-serialized to the caller
+try:
+    import numpy as np
+
+    def _decode_samples(values):
+        return np.fromiter((value[1] for value in values), dtype=np.float64, count=len(values)).tolist()
+except ImportError:
+    def _decode_samples(values):
+        return [float(value[1]) for value in values]
+
 class PrometheusAPI(BaseK8sClient):
 
     normal_metrics = [
@@ -53,7 +105,12 @@ class PrometheusAPI(BaseK8sClient):
         "container_network_transmit_errors_total",
         "container_network_transmit_packets_dropped_total",
         "container_network_transmit_packets_total",
-    ]   
+    ]
+
+    # Deduplicated metric list (order preserved) and the static __name__
+    # regex union, both computed once at class load
+    all_metrics = list(dict.fromkeys(normal_metrics + network_metrics))
+    _metrics_union = "|".join(all_metrics)
 
     def __init__(self, url: Optional[str] = None, namespace: Optional[str] = None) -> None:
         # Use ConfigManager if parameters not provided
@@ -67,6 +124,15 @@ class PrometheusAPI(BaseK8sClient):
         # Create prometheus client
         try:
             self.prometheusClient = PrometheusConnect(self.url, disable_ssl=True)
+            # Widen the session's connection pool so concurrent queries
+            # (e.g. per-pod fan-out for a service) reuse keep-alive
+            # connections instead of opening a socket per request
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
+            self.prometheusClient._session.mount("http://", adapter)
+            self.prometheusClient._session.mount("https://", adapter)
+            # Metric responses are highly compressible text; request gzip
+            # explicitly rather than relying on the session default
+            self.prometheusClient._session.headers["Accept-Encoding"] = "gzip"
         except Exception as e:
             logger.error("Error connecting to prometheus server: ", e)
         
@@ -76,22 +142,88 @@ class PrometheusAPI(BaseK8sClient):
         # Get list of pods and services using inherited methods
         self.pods = self.get_pods_list()
         self.services = self.get_services_list()
+        # Frozen snapshots for O(1) membership checks on every tool call
+        self._pods_set = frozenset(self.pods)
+        # Triage can read precomputed recording-rule series (see
+        # prometheus-rules.yaml) instead of evaluating thresholds inline
+        self._use_recording_rules = ConfigManager().config.prometheus_use_recording_rules
+        # The metric union and namespace are fixed for this instance, so the
+        # query text up to the pod matcher is assembled once; per-call work
+        # is reduced to appending the matcher and the closing braces
+        self._metrics_query_prefix = (
+            f'sum by (__name__, pod, container) '
+            f'({{__name__=~"{self._metrics_union}", namespace="{self.namespace}", '
+        )
     
-    def get_pod_metrics(self, pod_name: str) -> Dict[str, Any]:
+    def _pod_matcher(self, pod_name: str) -> str:
+        """
+            Build the PromQL pod label matcher.
+
+            Known pods get an exact match, which hits Prometheus's
+            posting-list index directly instead of a regex scan over every
+            label value; anything else falls back to an anchored, escaped
+            prefix regex so a partial name still resolves safely.
+        """
+        if pod_name in self._pods_set:
+            return f'pod="{pod_name}"'
+        return f'pod=~"{re.escape(pod_name)}.*"'
+
+    def _query(self, query: str) -> List[Dict[str, Any]]:
+        """Run an instant query, decoding the body with orjson when available.
+
+        PrometheusConnect parses responses with the stdlib json module;
+        going through its pooled session directly lets the (much faster)
+        orjson parser handle the payload instead.
+        """
+        response = self.prometheusClient._session.get(
+            f"{self.url}/api/v1/query",
+            params={"query": query},
+            verify=self.prometheusClient.ssl_verification,
+            headers=self.prometheusClient.headers,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP Status Code {response.status_code} ({response.content!r})")
+        return _json_loads(response.content)["data"]["result"]
+
+    def _query_range(self, query: str, start_time: datetime, end_time: datetime, step: str) -> List[Dict[str, Any]]:
+        """Run a range query, decoding the body with orjson when available"""
+        response = self.prometheusClient._session.get(
+            f"{self.url}/api/v1/query_range",
+            params={
+                "query": query,
+                "start": round(start_time.timestamp()),
+                "end": round(end_time.timestamp()),
+                "step": step,
+            },
+            verify=self.prometheusClient.ssl_verification,
+            headers=self.prometheusClient.headers,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP Status Code {response.status_code} ({response.content!r})")
+        return _json_loads(response.content)["data"]["result"]
+
+    def get_pod_metrics(self, pod_name: str, force_refresh: bool = False) -> Dict[str, Any]:
         """
             Get all metrics (no Istio) for given pods - INSTANT VALUES ONLY.
-            
+
+            Snapshots are cached for a few seconds per pod so back-to-back
+            tools inspecting the same pod don't re-query Prometheus; pass
+            force_refresh=True to bypass the cache.
+
             Args:
                 pod_name (str): Pod name
-            
+                force_refresh (bool): Skip the short-lived snapshot cache
+
             Returns:
                 dict: {resource_info, metrics: {metric_name: current_value}}
         """
-        
-        all_metrics = self.normal_metrics + self.network_metrics
-        # Remove duplicates
-        all_metrics = list(set(all_metrics))
-        
+        cache_key = (self.namespace, pod_name)
+        if not force_refresh:
+            with _metrics_cache_lock:
+                entry = _metrics_cache.get(cache_key)
+                if entry is not None and time.monotonic() < entry[0]:
+                    return entry[1]
+
         results = {
             "resource_type": "pod",
             "resource_namespace": self.namespace,
@@ -100,44 +232,59 @@ class PrometheusAPI(BaseK8sClient):
         }
 
         # Check if the pod exists
-        if pod_name not in self.pods:
+        if pod_name not in self._pods_set:
             results["error"] = f"The pod {pod_name} does not exist in the {self.namespace} namespace."
             return results
 
-        for metric in all_metrics:
-            try:
-                # Instant query
-                query = f'{metric}{{namespace="{self.namespace}", pod=~".*{pod_name}.*"}}'
-                data = self.prometheusClient.custom_query(query=query)
-                
-                if data:
-                    # Extract just the value from first result
-                    if len(data) > 0 and 'value' in data[0]:
-                        results["metrics"][metric] = float(data[0]['value'][1])
-                    else:
-                        results["metrics"][metric] = None
-                else:
-                    results["metrics"][metric] = None
-                    
-            except Exception as e:
-                results["metrics"][metric] = f"Error: {str(e)}"
+        # Absent series simply stay None
+        results["metrics"] = {metric: None for metric in self.all_metrics}
+
+        try:
+            # Single instant query for every metric; demultiplex by __name__
+            query = self._metrics_query_prefix + self._pod_matcher(pod_name) + "})"
+            data = self._query(query)
+
+            for series in data or []:
+                metric = series["metric"].get("__name__")
+                # Keep the first series per metric, as the per-metric queries did
+                if metric in results["metrics"] and results["metrics"][metric] is None and 'value' in series:
+                    results["metrics"][metric] = float(series['value'][1])
+
+        except Exception as e:
+            results["error"] = f"Error querying Prometheus: {str(e)}"
+
+        # Only successful snapshots are cached; errors should be retried
+        if "error" not in results:
+            with _metrics_cache_lock:
+                if len(_metrics_cache) >= _METRICS_CACHE_MAX:
+                    _metrics_cache.clear()
+                _metrics_cache[cache_key] = (time.monotonic() + _METRICS_CACHE_TTL, results)
 
         return results
-    
-    def get_pod_metrics_range(self, pod_name: str, range_minutes: int, step: str = "1m") -> Dict[str, Any]:
+
+    @staticmethod
+    def _adaptive_step(range_minutes: int) -> str:
+        """Pick a step bounding the response to ~200 points per series.
+
+        Range-query cost on the Prometheus side scales with the number of
+        evaluation steps, so long ranges get coarser resolution instead of
+        proportionally more work; 15 s is the floor for short ranges.
+        """
+        return f"{max(15, range_minutes * 60 // 200)}s"
+
+    def get_pod_metrics_range(self, pod_name: str, range_minutes: int, step: Optional[str] = None) -> Dict[str, Any]:
         """
             Get all metrics (no Istio) for given pod over a time range - TIME SERIES VALUES.
-            
+
             Args:
                 pod_name (str): Pod name
                 range_minutes (int): Time range in minutes from now backwards
-                step (str): Query resolution step (e.g., "15s", "1m", "5m")
+                step (str): Query resolution step (e.g., "15s", "1m", "5m");
+                    chosen adaptively from the range when omitted
         """
-        
-        all_metrics = self.normal_metrics + self.network_metrics
-        # Remove duplicates
-        all_metrics = list(set(all_metrics))
-        
+        if step is None:
+            step = self._adaptive_step(range_minutes)
+
         results = {
             "resource_type": "pod",
             "resource_namespace": self.namespace,
@@ -148,7 +295,7 @@ class PrometheusAPI(BaseK8sClient):
         }
 
         # Check if the pod exists
-        if pod_name not in self.pods:
+        if pod_name not in self._pods_set:
             results["error"] = f"The pod {pod_name} does not exist in the {self.namespace} namespace."
             return results
         
@@ -156,40 +303,211 @@ class PrometheusAPI(BaseK8sClient):
         end_time = datetime.now()
         start_time = end_time - timedelta(minutes=range_minutes)
 
-        for metric in all_metrics:
-            try:
-                # Range query
-                query = f'{metric}{{namespace="{self.namespace}", pod=~".*{pod_name}.*"}}'
-                data = self.prometheusClient.custom_query_range(
-                    query=query,
-                    start_time=start_time,
-                    end_time=end_time,
-                    step=step
-                )
-                
-                if data:
-                    # Extract values from time series data
-                    if len(data) > 0 and 'values' in data[0]:
-                        # Extract just the values (not timestamps) from the time series
-                        values = [float(value[1]) for value in data[0]['values']]
-                        results["metrics"][metric] = values
-                    else:
-                        results["metrics"][metric] = None
-                else:
-                    results["metrics"][metric] = None
-                    
-            except Exception as e:
-                results["metrics"][metric] = f"Error: {str(e)}"
+        # Absent series simply stay None
+        results["metrics"] = {metric: None for metric in self.all_metrics}
+
+        try:
+            # Single range query for every metric; demultiplex by __name__
+            query = self._metrics_query_prefix + self._pod_matcher(pod_name) + "})"
+            data = self._query_range(query, start_time, end_time, step)
+
+            for series in data or []:
+                metric = series["metric"].get("__name__")
+                # Keep the first series per metric, as the per-metric queries did
+                if metric in results["metrics"] and results["metrics"][metric] is None and 'values' in series:
+                    # Extract just the values (not timestamps) from the time series
+                    results["metrics"][metric] = _decode_samples(series['values'])
+
+        except Exception as e:
+            results["error"] = f"Error querying Prometheus: {str(e)}"
 
         return results
     
+    def get_service_metrics(self, service_name: str) -> Dict[str, Any]:
+        """
+            Get instant metrics for every pod behind a service with one query.
+
+            The pod names are folded into a single pod regex union, so N pods
+            cost one Prometheus round-trip instead of N; the response is
+            demultiplexed by (pod, __name__) into the same per-pod shape
+            that get_pod_metrics returns.
+
+            Args:
+                service_name (str): Service name
+
+            Returns:
+                dict: {service_name, pods: [per-pod metric dicts]}
+        """
+        pods = self.get_pods_from_service(service_name)
+        if "error" in pods:
+            return pods
+
+        service_metrics = {"service_name": service_name, "pods": []}
+        pod_names = [pod["pod_name"] for pod in pods["pods"]]
+
+        # Single-replica services are common; delegating to the per-pod path
+        # keeps the envelope identical while hitting the snapshot cache
+        if len(pod_names) == 1:
+            service_metrics["pods"] = [self.get_pod_metrics(pod_names[0])]
+            return service_metrics
+
+        per_pod = {
+            pod_name: {
+                "resource_type": "pod",
+                "resource_namespace": self.namespace,
+                "resource_name": pod_name,
+                "metrics": {metric: None for metric in self.all_metrics}
+            }
+            for pod_name in pod_names
+        }
+
+        if pod_names:
+            pods_union = "|".join(re.escape(pod_name) for pod_name in pod_names)
+            query = self._metrics_query_prefix + f'pod=~"{pods_union}"' + "})"
+            try:
+                data = self._query(query)
+                for series in data or []:
+                    labels = series["metric"]
+                    entry = per_pod.get(labels.get("pod"))
+                    metric = labels.get("__name__")
+                    if entry is not None and metric in entry["metrics"] \
+                            and entry["metrics"][metric] is None and 'value' in series:
+                        entry["metrics"][metric] = float(series['value'][1])
+            except Exception as e:
+                service_metrics["error"] = f"Error querying Prometheus: {str(e)}"
+
+        service_metrics["pods"] = list(per_pod.values())
+        return service_metrics
+
+    def get_service_metrics_range(self, service_name: str, range_minutes: int, step: Optional[str] = None) -> Dict[str, Any]:
+        """
+            Get range metrics for every pod behind a service with one query.
+
+            Same batching as get_service_metrics, but over a time range; the
+            per-pod dicts match get_pod_metrics_range's shape.
+
+            Args:
+                service_name (str): Service name
+                range_minutes (int): Time range in minutes from now backwards
+                step (str): Query resolution step (e.g., "15s", "1m", "5m");
+                    chosen adaptively from the range when omitted
+        """
+        if step is None:
+            step = self._adaptive_step(range_minutes)
+
+        pods = self.get_pods_from_service(service_name)
+        if "error" in pods:
+            return pods
+
+        service_metrics = {
+            "service_name": service_name,
+            "time_range_minutes": range_minutes,
+            "pods": []
+        }
+        pod_names = [pod["pod_name"] for pod in pods["pods"]]
+
+        # Same single-replica shortcut as get_service_metrics
+        if len(pod_names) == 1:
+            service_metrics["pods"] = [self.get_pod_metrics_range(pod_names[0], range_minutes, step)]
+            return service_metrics
+
+        per_pod = {
+            pod_name: {
+                "resource_type": "pod",
+                "resource_namespace": self.namespace,
+                "resource_name": pod_name,
+                "time_range_minutes": range_minutes,
+                "step": step,
+                "metrics": {metric: None for metric in self.all_metrics}
+            }
+            for pod_name in pod_names
+        }
+
+        if pod_names:
+            end_time = datetime.now()
+            start_time = end_time - timedelta(minutes=range_minutes)
+            pods_union = "|".join(re.escape(pod_name) for pod_name in pod_names)
+            query = self._metrics_query_prefix + f'pod=~"{pods_union}"' + "})"
+            try:
+                data = self._query_range(query, start_time, end_time, step)
+                for series in data or []:
+                    labels = series["metric"]
+                    entry = per_pod.get(labels.get("pod"))
+                    metric = labels.get("__name__")
+                    if entry is not None and metric in entry["metrics"] \
+                            and entry["metrics"][metric] is None and 'values' in series:
+                        entry["metrics"][metric] = _decode_samples(series['values'])
+            except Exception as e:
+                service_metrics["error"] = f"Error querying Prometheus: {str(e)}"
+
+        service_metrics["pods"] = list(per_pod.values())
+        return service_metrics
+
+    def get_pods_triage_metrics(self, pod_names: List[str], max_workers: int = 16) -> List[Dict[str, Any]]:
+        """
+        Triage several pods concurrently.
+
+        Each triage is one Prometheus HTTP query, so the work is I/O-bound
+        and a thread pool brings N-pod wall time from the sum of the
+        per-pod latencies down to roughly the slowest one. Results are
+        returned in the order of pod_names.
+
+        Args:
+            pod_names (List[str]): Pods to triage.
+            max_workers (int): Upper bound on concurrent queries.
+
+        Returns:
+            list: One triage result dict per pod (see get_pod_triage_metrics).
+        """
+        if not pod_names:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pod_names))) as pool:
+            return list(pool.map(self.get_pod_triage_metrics, pod_names))
+
+    # Triage rule expressions, evaluated server-side by Prometheus. Kept as
+    # standalone PromQL (with a {m} matcher placeholder) so they can also be
+    # promoted to recording rules later.
+    triage_rules = {
+        # The > 0 guard drops series where no pids limit is set (cadvisor
+        # reports threads_max as 0 there), which would otherwise divide to
+        # +Inf and fire a false critical
+        "thread_saturation": '(container_threads{{{m}}} / (container_threads_max{{{m}}} > 0)) > 0.95',
+        "high_cpu_load": 'container_cpu_load_average_10s{{{m}}} > 10',
+        "network_receive_errors": 'container_network_receive_errors_total{{{m}}} > 1',
+        "network_transmit_errors": 'container_network_transmit_errors_total{{{m}}} > 1',
+        "network_receive_drops": 'container_network_receive_packets_dropped_total{{{m}}} > 1',
+        "network_transmit_drops": 'container_network_transmit_packets_dropped_total{{{m}}} > 1',
+    }
+
+    # Recorded forms of the triage rules, precomputed by Prometheus when the
+    # shipped prometheus-rules.yaml group is loaded; names must stay in sync
+    _recorded_rule_prefix = "pod:triage_"
+    _recorded_rules_union = "|".join(f"pod:triage_{rule}" for rule in triage_rules)
+
+    # The or-joined label_replace chain never changes, so it is assembled
+    # once at class load with only the {m} matcher left to fill per call
+    _triage_query_template = " or ".join(
+        f'label_replace({expr}, "triage_rule", "{rule}", "", "")'
+        for rule, expr in triage_rules.items()
+    )
+
+    _network_rule_descriptions = {
+        "network_receive_errors": "receive errors",
+        "network_transmit_errors": "transmit errors",
+        "network_receive_drops": "dropped received packets",
+        "network_transmit_drops": "dropped transmitted packets",
+    }
+
     def get_pod_triage_metrics(self, pod_name: str) -> Dict[str, Any]:
         """
         Performs a simple triage based on universal, instant metrics without pod specs.
 
         This function checks for clear, high-confidence anomaly signals that do not require
         knowledge of the pod's resource limits. It's designed for a quick first-pass
-        health check.
+        health check. The thresholds are evaluated inside Prometheus with a
+        single query, so only the conditions that are currently failing come
+        back over the wire instead of the full metric set.
 
         Args:
             pod_name (str): The name of the pod to triage.
@@ -198,55 +516,61 @@ class PrometheusAPI(BaseK8sClient):
             dict: A dictionary containing the triage result.
                   {'is_anomalous': bool, 'reasons': [str], 'checked_metrics': {}}
         """
-        pod_data = self.get_pod_metrics(pod_name)
-        
         triage_result = {
             "pod_name" : pod_name,
             "is_anomalous": False,
             "reasons": [],
-            "checked_metrics": pod_data.get("metrics", {})
+            "checked_metrics": {}
         }
 
-        if "error" in pod_data:
+        if pod_name not in self._pods_set:
             triage_result["is_anomalous"] = True
-            triage_result["reasons"].append(pod_data["error"])
+            triage_result["reasons"].append(f"The pod {pod_name} does not exist in the {self.namespace} namespace.")
             return triage_result
 
-        metrics = pod_data.get("metrics", {})
+        matchers = f'namespace="{self.namespace}", {self._pod_matcher(pod_name)}'
+        if self._use_recording_rules:
+            # Precomputed series: one selector over the recorded rule names,
+            # no expression evaluation on the Prometheus side at all
+            query = f'{{__name__=~"{self._recorded_rules_union}", {matchers}}}'
+        else:
+            # Tag each rule's series with its name via label_replace so the
+            # or-joined result can be mapped back to a human-readable reason
+            query = self._triage_query_template.format(m=matchers)
 
-        # Triage Rule 1: Thread Saturation
-        threads = metrics.get("container_threads")
-        threads_max = metrics.get("container_threads_max")
-        if threads is not None and threads_max is not None and threads_max > 0:
-            thread_ratio = threads / threads_max
-            if thread_ratio > 0.95:
-                triage_result["is_anomalous"] = True
-                triage_result["reasons"].append(
-                    f"CRITICAL: Thread usage is at {thread_ratio:.2%} of the maximum ({int(threads)}/{int(threads_max)}). Application may hang or crash."
-                )
+        try:
+            data = self._query(query)
+        except Exception as e:
+            # A failed check must not read as a healthy pod
+            triage_result["is_anomalous"] = True
+            triage_result["reasons"].append(f"Error querying Prometheus: {str(e)}")
+            return triage_result
+
+        for series in data or []:
+            rule = series["metric"].get("triage_rule")
+            if rule is None:
+                # Recorded series carry the rule in their metric name instead
+                name = series["metric"].get("__name__", "")
+                if name.startswith(self._recorded_rule_prefix):
+                    rule = name[len(self._recorded_rule_prefix):]
+            if rule is None or 'value' not in series or rule in triage_result["checked_metrics"]:
+                continue
 
-        # Triage Rule 2: High CPU Load
-        cpu_load = metrics.get("container_cpu_load_average_10s")
-        if cpu_load is not None and cpu_load > 10.0:
+            value = float(series['value'][1])
+            triage_result["checked_metrics"][rule] = value
             triage_result["is_anomalous"] = True
-            triage_result["reasons"].append(
-                f"WARNING: High CPU load average of {cpu_load:.2f}. The CPU is likely saturated, causing high latency."
-            )
-
-        # Triage Rule 3: Network Errors & Drops
-        # This checks if any errors have occurred during the pod's lifetime.
-        network_checks = {
-            "container_network_receive_errors_total": "receive errors",
-            "container_network_transmit_errors_total": "transmit errors",
-            "container_network_receive_packets_dropped_total": "dropped received packets",
-            "container_network_transmit_packets_dropped_total": "dropped transmitted packets",
-        }
-        for metric, description in network_checks.items():
-            value = metrics.get(metric)
-            if value is not None and value > 1:
-                triage_result["is_anomalous"] = True
+
+            if rule == "thread_saturation":
+                triage_result["reasons"].append(
+                    f"CRITICAL: Thread usage is at {value:.2%} of the maximum. Application may hang or crash."
+                )
+            elif rule == "high_cpu_load":
+                triage_result["reasons"].append(
+                    f"WARNING: High CPU load average of {value:.2f}. The CPU is likely saturated, causing high latency."
+                )
+            else:
                 triage_result["reasons"].append(
-                    f"INFO: Pod has a history of {int(value)} network {description}."
+                    f"INFO: Pod has a history of {int(value)} network {self._network_rule_descriptions[rule]}."
                 )
 
         return triage_result
\ No newline at end of file
@@ -1,143 +1,141 @@
 from mcp.server.fastmcp import FastMCP
+import anyio
 import logging
 import sys
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pydantic import Field
 from typing import Literal
 from typing_extensions import Annotated
 from api.config_manager import ConfigManager
-from api.prometheus_api import PrometheusAPI
-from api.log_api import LogAPI
+from api.prometheus_api import PrometheusAPI, get_prometheus_api
+from api.log_api import LogAPI, get_log_api
 from api.jaeger_api import JaegerAPI
 from api.datagraph import DataGraph
 
-# Global instances - initialized lazily
-prometheus_api = None
-datagraph = None
-log_api = None
-jaeger_api = None
+# Shared executor for fanning tool work out across the pods of a service;
+# module-level so threads are reused across tool calls instead of being
+# spawned per invocation
+_fanout_executor = ThreadPoolExecutor(max_workers=32)
 
-def get_apis():
-    """Get or create all API instances using singleton pattern"""
-    config_manager = ConfigManager()
-    config = config_manager.config
-    
-    global prometheus_api, datagraph, log_api, jaeger_api
-    
-    if prometheus_api is None:
-        prometheus_api = PrometheusAPI(config.prometheus_url, config.target_namespace)
-    if datagraph is None:
-        datagraph = DataGraph(config.neo4j_uri, config.neo4j_user, config.neo4j_password)
-    if log_api is None:
-        log_api = LogAPI(config.target_namespace)
-    if jaeger_api is None:
-        jaeger_api = JaegerAPI(config.jaeger_url)
-    
-    return prometheus_api, datagraph, log_api, jaeger_api
+@dataclass(frozen=True, slots=True)
+class Apis:
+    """Immutable bundle of the backend clients shared by every tool"""
+    prometheus: PrometheusAPI
+    graph: DataGraph
+    log: LogAPI
+    jaeger: JaegerAPI
 
-def get_prometheus_api():
-    """Get or create the PrometheusAPI instance"""
-    prometheus_api, _, _, _ = get_apis()
-    return prometheus_api
+# Built lazily on first use, then every call is one global load
+_apis_instance = None
+_apis_lock = threading.Lock()
 
-def get_datagraph():
-    """Get or create the DataGraph instance"""
-    _, datagraph, _, _ = get_apis()
-    return datagraph
+def get_apis() -> Apis:
+    """Get or create the shared API bundle using singleton pattern"""
+    global _apis_instance
 
-def get_log_api():
-    """Get or create the LogAPI instance"""
-    _, _, log_api, _ = get_apis()
-    return log_api
+    # Fast path once everything is built: no lock, no ConfigManager lookup
+    apis = _apis_instance
+    if apis is not None:
+        return apis
 
-def get_jaeger_api():
-    """Get or create the JaegerAPI instance"""
-    _, _, _, jaeger_api = get_apis()
-    return jaeger_api
+    # Double-checked under a lock so concurrent tool calls can't race and
+    # build duplicate drivers/sessions; the four constructors are
+    # independent I/O-bound handshakes, so they run in parallel
+    with _apis_lock:
+        if _apis_instance is None:
+            config = ConfigManager().config
+            # The Prometheus and log clients go through their per-namespace
+            # factories so anything else importing them shares the instances
+            prometheus_future = _fanout_executor.submit(
+                get_prometheus_api, config.target_namespace)
+            graph_future = _fanout_executor.submit(
+                DataGraph, config.neo4j_uri, config.neo4j_user, config.neo4j_password)
+            log_future = _fanout_executor.submit(get_log_api, config.target_namespace)
+            jaeger_future = _fanout_executor.submit(JaegerAPI, config.jaeger_url)
+            _apis_instance = Apis(
+                prometheus=prometheus_future.result(),
+                graph=graph_future.result(),
+                log=log_future.result(),
+                jaeger=jaeger_future.result(),
+            )
+        return _apis_instance
 
 mcp = FastMCP("Cluster API MCP")
 
+# The API clients are synchronous (requests / kubernetes / neo4j), so the
+# tool handlers are async shims that push the blocking work onto a worker
+# thread. Concurrent tool calls then overlap their I/O instead of
+# serializing on the event loop, while the clients keep their shared
+# pooled sessions.
+def _run_sync(fn, *args):
+    return anyio.to_thread.run_sync(fn, *args)
+
+# Dispatch tables keyed on resource_type: adding a new resource kind (e.g.
+# deployment) means one entry per tool instead of another if/else chain.
+# The service entries issue one aggregated Prometheus query per call.
+_METRICS_DISPATCH = {
+    "pod": lambda api, name: api.get_pod_metrics(name),
+    "service": lambda api, name: api.get_service_metrics(name),
+}
+
+_METRICS_RANGE_DISPATCH = {
+    "pod": lambda api, name, minutes: api.get_pod_metrics_range(name, minutes),
+    "service": lambda api, name, minutes: api.get_service_metrics_range(name, minutes),
+}
+
+def _get_metrics_impl(resource_name: str, resource_type: str) -> dict:
+    return _METRICS_DISPATCH[resource_type](get_apis().prometheus, resource_name)
+
 @mcp.tool(
     title="get_metrics",
     description="Retrieve all instant Prometheus metrics for a specific Kubernetes pod or service. Returns comprehensive metrics including CPU, memory, network, and container specifications.",
 )
-def get_metrics(
+async def get_metrics(
     resource_name: Annotated[str, Field(description="The exact name of the Kubernetes resource to retrieve metrics for.")],
     resource_type: Annotated[Literal["pod","service"], Field(description="Type of Kubernetes resource. 'pod' returns metrics for a single pod. 'service' returns aggregated metrics for all pods behind the service.")]
-        
+
 ) -> dict:
     """Get all the Prometheus metrics associated with a specific cluster resource"""
-    api = get_prometheus_api()
-    if resource_type == "pod":
-        return api.get_pod_metrics(resource_name)
-    else:
-        pods = api.get_pods_from_service(resource_name)
-        
-        if "error" in pods.keys():
-            return pods
-        
-        # Aggregate metrics from all pods in the service
-        service_metrics = {
-            "service_name": resource_name,
-            "pods": []
-        }
-        
-        for pod in pods["pods"]:
-            pod_metrics = api.get_pod_metrics(pod["pod_name"])
-            service_metrics["pods"].append(pod_metrics)
-        
-        return service_metrics
+    return await _run_sync(_get_metrics_impl, resource_name, resource_type)
+
+def _get_metrics_range_impl(resource_name: str, resource_type: str, time_range_minutes: int) -> dict:
+    return _METRICS_RANGE_DISPATCH[resource_type](get_apis().prometheus, resource_name, time_range_minutes)
 
 @mcp.tool(
     title="get_metrics_range",
-    description="Retrieve historical Prometheus metrics for a specific Kubernetes pod or service over a time range."
-)  
-def get_metrics_range(
+    description="Retrieve historical Prometheus metrics for a specific Kubernetes pod or service over a time range. The sampling resolution is chosen automatically from the range, so each series holds roughly 200 points regardless of how far back the query reaches."
+)
+async def get_metrics_range(
     resource_name: Annotated[str, Field(description="The exact name of the Kubernetes resource to retrieve metrics for.")],
     resource_type: Annotated[Literal["pod","service"], Field(description="Type of Kubernetes resource. 'pod' returns metrics for a single pod. 'service' returns aggregated metrics for all pods behind the service.")],
     time_range_minutes: Annotated[int, Field(description="The time range in minutes to retrieve historical metrics from now. Must be at least 1 minute.", ge=1)]
 ) -> dict:
     """Get historical Prometheus metrics for a resource over a specified time range from now"""
-    api = get_prometheus_api()
-    if resource_type == "pod":
-        return api.get_pod_metrics_range(resource_name, time_range_minutes)
-    else:
-        pods = api.get_pods_from_service(resource_name)
-        
-        if "error" in pods.keys():
-            return pods
-        
-        # Aggregate metrics from all pods in the service
-        service_metrics = {
-            "service_name": resource_name,
-            "time_range_minutes": time_range_minutes,
-            "pods": []
-        }
-        
-        for pod in pods["pods"]:
-            pod_metrics = api.get_pod_metrics_range(pod["pod_name"], time_range_minutes)
-            service_metrics["pods"].append(pod_metrics)
-        
-        return service_metrics
+    return await _run_sync(_get_metrics_range_impl, resource_name, resource_type, time_range_minutes)
 
 @mcp.tool(
     title="get_pods_from_service",
     description="Retrieve all Kubernetes pods that belong to a specific service. Returns pod names and their current status (Running, Pending, etc.)."
 )
-def get_pods_from_service(
+async def get_pods_from_service(
     service_name: Annotated[str, Field(description="The exact name of the Kubernetes service to find associated pods for.")]
 ) -> dict:
     """Get all the pods associated with a specific service"""
-    api = get_prometheus_api()
-    return api.get_pods_from_service(service_name)
+    return await _run_sync(lambda: get_apis().prometheus.get_pods_from_service(service_name))
 
 @mcp.tool(
     title="get_cluster_overview",
     description="Get a comprehensive overview of the Kubernetes cluster including all pods and services. Returns counts and complete lists for cluster analysis."
 )
-def get_cluster_pods_and_services() -> dict:
+async def get_cluster_pods_and_services() -> dict:
     """Get the complete list of all pods and services in the target Kubernetes namespace"""
-    api = get_prometheus_api()
+    return await _run_sync(_get_cluster_pods_and_services_impl)
+
+def _get_cluster_pods_and_services_impl() -> dict:
+    api = get_apis().prometheus
     pods = api.get_pods_list()
     services = api.get_services_list()
     return {
@@ -151,11 +149,14 @@ def get_cluster_pods_and_services() -> dict:
     title="get_services_used_by",
     description="Return all the services that are used by the given service to complete its tasks. This shows the service dependency chain - which services the target service calls to fulfill requests."
 )
-def get_services_used_by(
+async def get_services_used_by(
     service: Annotated[str, Field(description="The name of the service to analyze for its service dependencies.")]
 ) -> dict:
     """Return all the services that are used by the given service to complete its tasks"""
-    graph = get_datagraph()
+    return await _run_sync(_get_services_used_by_impl, service)
+
+def _get_services_used_by_impl(service: str) -> dict:
+    graph = get_apis().graph
     services_used = graph.get_services_used_by(service)
     
     if isinstance(services_used, str):
@@ -173,11 +174,14 @@ def get_services_used_by(
     title="get_dependencies",
     description="Retrieves all dependencies for a specified service from kubernetes cluster. Dependencies include databases and other infrastructure components."
 )
-def get_dependencies(
+async def get_dependencies(
     service: Annotated[str, Field(description="The name of the service to analyze for its infrastructure dependencies.")]
 ) -> dict:
     """Retrieves all dependencies (databases, external services, etc.) for a specified service"""
-    graph = get_datagraph()
+    return await _run_sync(_get_dependencies_impl, service)
+
+def _get_dependencies_impl(service: str) -> dict:
+    graph = get_apis().graph
     dependencies = graph.get_dependencies(service)
     
     if isinstance(dependencies, str):
@@ -194,59 +198,84 @@ def get_dependencies(
     title="get_logs",
     description="Retrieve logs from a Kubernetes pod or service with optional filtering for important messages."
 )
-def get_logs(
+async def get_logs(
     resource_name: Annotated[str, Field(description="The exact name of the Kubernetes resource to retrieve logs from.")],
     resource_type: Annotated[Literal["pod","service"], Field(description="Type of Kubernetes resource. 'pod' returns logs for a single pod. 'service' returns logs for all pods behind the service.")],
     tail: Annotated[int, Field(description="Number of recent log lines to retrieve.", ge=1)] = 100,
     important: Annotated[bool, Field(description="If True, filter logs to only include lines with ERROR, WARN, or CRITICAL keywords.")] = True,
 ) -> str:
     """Retrieves the last log entries of a pod or service with optional filtering for important messages"""
-    log_api_instance = get_log_api()
-    
-    if resource_type == "pod":
-        return log_api_instance.get_pod_logs(resource_name, tail, important)
-    else:
-        # Get pods from service first
-        api = get_prometheus_api()
-        pods = api.get_pods_from_service(resource_name)
-        
-        if "error" in pods.keys():
-            return f"Error getting pods for service '{resource_name}': {pods['error']}"
-        
-        # Collect logs from all pods in the service
-        service_logs = f"=== Logs for service '{resource_name}' ===\n\n"
-        
-        for pod in pods["pods"]:
-            pod_logs = log_api_instance.get_pod_logs(pod["pod_name"], tail, important)
-            service_logs += f"--- Pod: {pod['pod_name']} ---\n"
-            service_logs += pod_logs
-            service_logs += "\n\n"
-        
-        return service_logs
+    return await _run_sync(_get_logs_impl, resource_name, resource_type, tail, important)
+
+def _get_pod_logs(resource_name: str, tail: int, important: bool) -> str:
+    return get_apis().log.get_pod_logs(resource_name, tail, important)
+
+def _get_service_logs(resource_name: str, tail: int, important: bool) -> str:
+    # Get pods from service first
+    apis = get_apis()
+    pods = apis.prometheus.get_pods_from_service(resource_name)
+
+    if "error" in pods:
+        return f"Error getting pods for service '{resource_name}': {pods['error']}"
+
+    pod_names = [pod["pod_name"] for pod in pods["pods"]]
+
+    # Single-replica fast path: no executor round-trip for a one-pod service
+    if len(pod_names) == 1:
+        return (
+            f"=== Logs for service '{resource_name}' ===\n\n"
+            f"--- Pod: {pod_names[0]} ---\n"
+            f"{apis.log.get_pod_logs(pod_names[0], tail, important)}\n\n"
+        )
+
+    # Collect logs from all pods in the service in parallel, then stitch
+    # the sections together with one join instead of repeated string +=
+    futures = [
+        _fanout_executor.submit(apis.log.get_pod_logs, pod_name, tail, important)
+        for pod_name in pod_names
+    ]
+
+    parts = [f"=== Logs for service '{resource_name}' ===\n\n"]
+    for pod_name, future in zip(pod_names, futures):
+        parts.append(f"--- Pod: {pod_name} ---\n")
+        parts.append(future.result())
+        parts.append("\n\n")
+
+    return "".join(parts)
+
+_LOGS_DISPATCH = {
+    "pod": _get_pod_logs,
+    "service": _get_service_logs,
+}
+
+def _get_logs_impl(resource_name: str, resource_type: str, tail: int, important: bool) -> str:
+    return _LOGS_DISPATCH[resource_type](resource_name, tail, important)
 
 @mcp.tool(
     title="get_traces",
     description="Retrieve traces for a specific service, with an option to filter for traces that contain errors. Returns a list of traces, each containing: traceID (unique trace identifier), latency_ms (total trace duration in milliseconds), has_error (boolean indicating if the trace contains errors), and sequence (string showing the service call chain, e.g., 'serviceA -> serviceB -> serviceC')."
 )
-def get_traces(
+async def get_traces(
         service_name: Annotated[str, Field(description="The name of the service for which to retrieve traces.")],
         only_errors: Annotated[bool, Field(description="If True, return only traces that contain errors.")] = False
 ) -> dict:
-    
-    jaeger = get_jaeger_api()
-    traces = jaeger.get_processed_traces(service_name, only_errors=only_errors)
 
-    return traces
+    return await _run_sync(
+        lambda: get_apis().jaeger.get_processed_traces(service_name, only_errors=only_errors)
+    )
 
 @mcp.tool(
     title="get_trace",
     description="Retrieve detailed information for a specific trace by its trace ID. Returns the complete trace with all spans, including service names, operation names, timestamps, durations, tags, and any errors."
 )
-def get_trace(
+async def get_trace(
     trace_id: Annotated[str, Field(description="The unique trace ID to retrieve detailed information for.")]
 ) -> dict:
     """Get detailed information for a specific trace by trace ID"""
-    jaeger = get_jaeger_api()
+    return await _run_sync(_get_trace_impl, trace_id)
+
+def _get_trace_impl(trace_id: str) -> dict:
+    jaeger = get_apis().jaeger
     result = jaeger.get_trace(trace_id)
     if result is None:
         return {"error": f"Trace with ID '{trace_id}' not found"}